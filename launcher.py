@@ -68,6 +68,7 @@ class TrayApp:
             MenuItem("Start Tracking", self.start_tracking),
             MenuItem("Stop Tracking", self.stop_tracking),
             MenuItem("Summarize", self.summarize),
+            MenuItem("Cancel Summary", self.cancel_summary),
             MenuItem("OpenAI API Key", self.open_env),
             MenuItem("Settings", self.open_config),
             MenuItem("Exit", self.quit_app)
@@ -107,6 +108,13 @@ class TrayApp:
             get_logger().info("Sent 'summarize' command.")
             self.show_dialog("Summarize Command Sent", "The tracker will summarize the day's activity.")
 
+    def cancel_summary(self, icon, item) -> None:
+        """Send a command to the tracker process to cancel the running summary."""
+        if self.tracker_process and self.tracker_process.is_alive():
+            self.cmd_queue.put("cancel_summary")
+            get_logger().info("Sent 'cancel_summary' command.")
+            self.show_dialog("Cancel Command Sent", "The tracker will cancel the summary in progress.")
+
     def open_file(self, path: Path) -> None:
         """Open a file with the default system editor."""
         try:
@@ -8,8 +8,9 @@ import threading
 from tracker.window_tracker import track_windows
 from tracker.keystroke_tracker import start_keystroke_logger
 from tracker.idle_detector import start_listeners, idle_watcher
-from summarizer.gpt_summary import summarize_day
+from summarizer.summary_jobs import request_summary, cancel_summary, shutdown_summary_service
 from storage.db import init_db
+from storage.sessions import flush_sessions
 from storage.security import setup_security
 from summarizer.gpt_summary import listen_for_summary_trigger, schedule_nightly_summary
 
@@ -47,7 +48,10 @@ def run_tracker(cmd_queue=None) -> None:
                 cmd = cmd_queue.get()
                 if cmd == "summarize":
                     get_logger().info("Summarize command received from tray")
-                    summarize_day()
+                    request_summary("tray")
+                elif cmd == "cancel_summary":
+                    get_logger().info("Cancel summary command received from tray")
+                    cancel_summary()
             time.sleep(1)
 
     threading.Thread(target=command_loop, daemon=True).start()
@@ -57,6 +61,9 @@ def run_tracker(cmd_queue=None) -> None:
         track_windows()
     except KeyboardInterrupt:
         get_logger().info("Desktop Activity Tracker stopped by user.")
+    finally:
+        shutdown_summary_service()
+        flush_sessions()
 
 if __name__ == "__main__":
     run_tracker()
@@ -5,8 +5,17 @@ Handles activity, keystroke, and idle event logging.
 
 import sqlite3
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from typing import Callable
 from config.load_config import config_data
+from storage.search import init_search, index_typed_keys, reset_typed_segment
+from storage.sessions import init_sessions, record_activity, record_idle, reset_session
+
+# Write-path LRU caches of interned string -> id, one per lookup table
+_intern_cache = {"apps": OrderedDict(), "titles": OrderedDict()}
+_intern_lock = threading.Lock()
 
 # Initialize logger for database operations
 main_logger = None
@@ -19,28 +28,145 @@ def get_logger():
     return main_logger
 
 def init_db() -> None:
-    """Initialize the SQLite database and tables if not present."""
+    """
+    Initialize the SQLite database and tables if not present.
+    Raises if the activity table cannot be migrated, so nothing is logged against the old schema.
+    """
     # Ensure logs directory exists
     os.makedirs(config_data["DB_PATH"], exist_ok=True)
     try:
         with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
             c = conn.cursor()
-            c.execute("CREATE TABLE IF NOT EXISTS activity (timestamp TEXT, app TEXT, title TEXT, duration REAL)")
+            c.execute("CREATE TABLE IF NOT EXISTS apps (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)")
+            c.execute("CREATE TABLE IF NOT EXISTS titles (id INTEGER PRIMARY KEY, title TEXT UNIQUE NOT NULL)")
             c.execute("CREATE TABLE IF NOT EXISTS keystrokes (timestamp TEXT, key TEXT)")
             c.execute("CREATE TABLE IF NOT EXISTS idle (timestamp TEXT, duration REAL)")
             conn.commit()
+
+            # Explicit transaction for the migration: sqlite3 would otherwise autocommit each DDL
+            # statement, leaving a half-migrated activity table behind if a later step fails
+            c.execute("BEGIN")
+            rename = "app" in [row[1] for row in c.execute("PRAGMA table_info(activity)")]
+            if rename:
+                c.execute("ALTER TABLE activity RENAME TO activity_legacy")
+            c.execute("CREATE TABLE IF NOT EXISTS activity (timestamp TEXT, app_id INTEGER REFERENCES apps(id), title_id INTEGER REFERENCES titles(id), duration REAL)")
+            # Also resumes a migration an earlier version left behind in activity_legacy
+            migrate = c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activity_legacy'").fetchone() is not None
+            if migrate:
+                _migrate_legacy_activity(c)
+            c.execute("""
+                CREATE VIEW IF NOT EXISTS activity_named AS
+                SELECT activity.timestamp, apps.name AS app, titles.title AS title, activity.duration
+                FROM activity
+                JOIN apps ON apps.id = activity.app_id
+                JOIN titles ON titles.id = activity.title_id
+            """)
+            conn.commit()
+            if migrate:
+                # Reclaim the space freed by dropping the text columns; the migration itself is already committed
+                try:
+                    conn.execute("VACUUM")
+                except sqlite3.Error as e:
+                    get_logger().warning(f"Failed to compact database after migration: {e}")
         get_logger().info("Database initialized with activity, keystrokes, and idle tables.")
     except Exception as e:
         get_logger().error(f"Failed to initialize database: {e}")
+        raise
+
+    # Derived indexes are optional: tracking must keep working without them
+    _init_index("search index", init_search)
+    _init_index("sessions", init_sessions)
+
+def _init_index(name: str, setup: Callable) -> None:
+    """Create a derived index in its own transaction after the core schema has committed; log and skip it on failure."""
+    try:
+        with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+            c = conn.cursor()
+            c.execute("BEGIN")
+            setup(c)
+            conn.commit()
+        get_logger().info(f"Initialized {name}.")
+    except Exception as e:
+        get_logger().error(f"Failed to initialize {name}, continuing without it: {e}")
+
+def _migrate_legacy_activity(c: sqlite3.Cursor) -> None:
+    """Move rows from the old text-column activity table into the interned schema."""
+    c.execute("INSERT OR IGNORE INTO apps (name) SELECT DISTINCT COALESCE(app, '') FROM activity_legacy")
+    c.execute("INSERT OR IGNORE INTO titles (title) SELECT DISTINCT COALESCE(title, '') FROM activity_legacy")
+    c.execute("""
+        INSERT INTO activity (timestamp, app_id, title_id, duration)
+        SELECT l.timestamp, apps.id, titles.id, l.duration
+        FROM activity_legacy l
+        JOIN apps ON apps.name = COALESCE(l.app, '')
+        JOIN titles ON titles.title = COALESCE(l.title, '')
+        ORDER BY l.rowid
+    """)
+    c.execute("DROP TABLE activity_legacy")
+    get_logger().info("Migrated activity table to interned app and title ids.")
+
+def _intern(conn: sqlite3.Connection, table: str, column: str, value: str) -> int:
+    """Return the id for value in a lookup table, inserting it on first sight."""
+    cache = _intern_cache[table]
+    with _intern_lock:
+        if value in cache:
+            cache.move_to_end(value)
+            return cache[value]
+    conn.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+    return conn.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+
+def _remember(table: str, value: str, row_id: int) -> None:
+    """Cache a committed string -> id mapping, evicting the least recently used entry."""
+    cache = _intern_cache[table]
+    with _intern_lock:
+        cache[value] = row_id
+        cache.move_to_end(value)
+        if len(cache) > config_data["INTERN_CACHE_SIZE"]:
+            cache.popitem(last=False)
+
+def intern_window(conn: sqlite3.Connection, app: str, title: str) -> tuple[int, int]:
+    """
+    Return the (app_id, title_id) pair for a window, interning new strings.
+    Call remember_window() once the transaction has committed so the ids can be cached.
+    """
+    return _intern(conn, "apps", "name", app or ""), _intern(conn, "titles", "title", title or "")
+
+def remember_window(app: str, title: str, app_id: int, title_id: int) -> None:
+    """Publish committed window ids to the write-path cache; uncommitted ids must never be shared."""
+    _remember("apps", app or "", app_id)
+    _remember("titles", title or "", title_id)
+
+def resolve_window(app_id: int, title_id: int) -> tuple[str, str]:
+    """Return the (app, title) strings for an interned window id pair."""
+    with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+        app = conn.execute("SELECT name FROM apps WHERE id = ?", (app_id,)).fetchone()
+        title = conn.execute("SELECT title FROM titles WHERE id = ?", (title_id,)).fetchone()
+    return (app[0] if app else ""), (title[0] if title else "")
+
+def _update_index(conn: sqlite3.Connection, name: str, update: Callable, reset: Callable) -> None:
+    """Run a secondary index update in a savepoint so its failure never rolls back the raw insert."""
+    conn.execute(f"SAVEPOINT {name}")
+    try:
+        update()
+    except Exception as e:
+        conn.execute(f"ROLLBACK TO {name}")
+        reset()
+        get_logger().error(f"Failed to update {name}: {e}")
+    conn.execute(f"RELEASE {name}")
 
 def log_activity(app: str, title: str, duration: float) -> None:
     """Log an application window activity event."""
     try:
         with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
-            conn.execute("INSERT INTO activity VALUES (?, ?, ?, ?)", (datetime.now().isoformat(), app, title, duration))
+            now = datetime.now().isoformat()
+            app_id, title_id = intern_window(conn, app, title)
+            conn.execute("INSERT INTO activity VALUES (?, ?, ?, ?)", (now, app_id, title_id, duration))
+            _update_index(conn, "session_index", lambda: record_activity(conn, now, app_id, title_id, title, duration), reset_session)
             conn.commit()
+        remember_window(app, title, app_id, title_id)
         get_logger().info(f"Activity logged: {app} - {title} ({duration:.2f}s)")
     except Exception as e:
+        # The session row written inside the rolled-back transaction may no longer exist
+        reset_session()
         get_logger().error(f"Failed to log activity: {e}")
 
 def log_keystroke(key: str) -> None:
@@ -61,17 +187,23 @@ def log_keystrokes_batch(keys: list[str]) -> None:
     try:
         with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
             conn.executemany("INSERT INTO keystrokes VALUES (?, ?)", [(now, k) for k in keys])
+            _update_index(conn, "typed_index", lambda: index_typed_keys(conn, now, keys), reset_typed_segment)
             conn.commit()
         get_logger().info(f"Batch keystrokes logged: {len(keys)} keys")
     except Exception as e:
+        # The open typed segment may have been rolled back with this batch
+        reset_typed_segment()
         get_logger().error(f"Failed to log keystrokes batch: {e}")
 
 def log_idle(duration: float) -> None:
     """Log an idle event (user inactivity)."""
     try:
         with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
-            conn.execute("INSERT INTO idle VALUES (?, ?)", (datetime.now().isoformat(), duration))
+            now = datetime.now().isoformat()
+            conn.execute("INSERT INTO idle VALUES (?, ?)", (now, duration))
+            _update_index(conn, "session_index", lambda: record_idle(conn, now, duration), reset_session)
             conn.commit()
         get_logger().info(f"Idle event logged: {duration:.0f}s")
     except Exception as e:
+        reset_session()
         get_logger().error(f"Failed to log idle: {e}")
\ No newline at end of file
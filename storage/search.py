@@ -0,0 +1,258 @@
+"""
+Full-text search for Desktop Activity Tracker.
+Maintains SQLite FTS5 indexes over window titles and typed text, and returns ranked time ranges.
+"""
+
+import argparse
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from itertools import chain, zip_longest
+from typing import Optional
+from config.load_config import config_data
+
+# Typed text segments are closed once they grow past this many characters
+MAX_SEGMENT_CHARS = 1000
+
+# Key names that map to text when rebuilding typed segments
+_KEY_TEXT = {"Key.space": " ", "Key.tab": " "}
+_SEGMENT_BREAKS = {"Key.enter", "[REDACTED]"}
+
+# Keep the external-content FTS tables in step with their source tables
+_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS titles_ai AFTER INSERT ON titles BEGIN
+        INSERT INTO titles_fts (rowid, title) VALUES (new.id, new.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS titles_ad AFTER DELETE ON titles BEGIN
+        INSERT INTO titles_fts (titles_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS typed_segments_ai AFTER INSERT ON typed_segments BEGIN
+        INSERT INTO typed_fts (rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS typed_segments_ad AFTER DELETE ON typed_segments BEGIN
+        INSERT INTO typed_fts (typed_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS typed_segments_au AFTER UPDATE OF text ON typed_segments BEGIN
+        INSERT INTO typed_fts (typed_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO typed_fts (rowid, text) VALUES (new.id, new.text);
+    END""",
+)
+
+# Initialize logger for search operations
+main_logger = None
+def get_logger():
+    """Get the main logger instance, initializing it if necessary."""
+    global main_logger
+    if main_logger is None:
+        from logging_utils.logger import init_logger
+        main_logger = init_logger("SEARCH")
+    return main_logger
+
+class TypedSegmenter:
+    """
+    Rebuilds readable text from raw key names, one open segment at a time.
+    Segments end on Enter, on redacted input, on a typing gap or when they grow too long,
+    so sensitive keystrokes are never joined to the surrounding text.
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the open segment; the next key starts a new one."""
+        self.segment_id = None
+        self.saved_text = None
+        self.chars = []
+        self.start = None
+        self.end = None
+
+    def feed(self, conn: sqlite3.Connection, timestamp: str, keys: list[str]) -> None:
+        """Append a batch of keys logged at timestamp and persist the affected segments."""
+        with self.lock:
+            if self.end is not None and _seconds_between(self.end, timestamp) > config_data["SEARCH_SEGMENT_GAP"]:
+                self._close(conn)
+            for k in keys:
+                if k in _SEGMENT_BREAKS:
+                    self._close(conn)
+                    continue
+                if len(self.chars) >= MAX_SEGMENT_CHARS:
+                    self._close(conn)
+                if k == "Key.backspace":
+                    if self.chars:
+                        self.chars.pop()
+                    continue
+                text = _KEY_TEXT.get(k, k if k and len(k) == 1 else None)
+                if text is None:
+                    continue
+                if self.start is None:
+                    self.start = timestamp
+                self.chars.append(text)
+                self.end = timestamp
+            self._save(conn)
+
+    def _close(self, conn: sqlite3.Connection) -> None:
+        """Persist and end the open segment."""
+        self._save(conn)
+        self.reset()
+
+    def _save(self, conn: sqlite3.Connection) -> None:
+        """Insert or update the open segment row; the FTS triggers keep the index in sync."""
+        text = "".join(self.chars).strip()
+        if not text or text == self.saved_text:
+            return
+        if self.segment_id is None:
+            cur = conn.execute(
+                "INSERT INTO typed_segments (start, end, text) VALUES (?, ?, ?)",
+                (self.start, self.end, text)
+            )
+            self.segment_id = cur.lastrowid
+        else:
+            conn.execute(
+                "UPDATE typed_segments SET end = ?, text = ? WHERE id = ?",
+                (self.end, text, self.segment_id)
+            )
+        self.saved_text = text
+
+# Segmenter fed by the live keystroke logger
+_live_segmenter = TypedSegmenter()
+
+def _seconds_between(earlier: str, later: str) -> float:
+    """Return the number of seconds between two ISO timestamps."""
+    return (datetime.fromisoformat(later) - datetime.fromisoformat(earlier)).total_seconds()
+
+def init_search(c: sqlite3.Cursor) -> None:
+    """Create the FTS5 indexes and their sync triggers, backfilling existing data on first run."""
+    existing = {row[0] for row in c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_activity_title ON activity (title_id, timestamp)")
+    c.execute("CREATE TABLE IF NOT EXISTS typed_segments (id INTEGER PRIMARY KEY, start TEXT, end TEXT, text TEXT)")
+
+    # External-content indexes: the text lives once in titles/typed_segments
+    c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS titles_fts USING fts5(title, content='titles', content_rowid='id')")
+    c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS typed_fts USING fts5(text, content='typed_segments', content_rowid='id')")
+    for trigger in _TRIGGERS:
+        c.execute(trigger)
+
+    if "titles_fts" not in existing:
+        c.execute("INSERT INTO titles_fts (titles_fts) VALUES ('rebuild')")
+        get_logger().info("Built window title search index.")
+    if "typed_segments" not in existing and "keystrokes" in existing:
+        _backfill_typed_segments(c.connection)
+        get_logger().info("Built typed text search index from existing keystrokes.")
+
+def _backfill_typed_segments(conn: sqlite3.Connection) -> None:
+    """Rebuild typed segments from every keystroke already in the database."""
+    segmenter = TypedSegmenter()
+    batch_time, batch = None, []
+    for timestamp, key in conn.execute("SELECT timestamp, key FROM keystrokes ORDER BY rowid"):
+        if timestamp != batch_time and batch:
+            segmenter.feed(conn, batch_time, batch)
+            batch = []
+        batch_time = timestamp
+        batch.append(key)
+    if batch:
+        segmenter.feed(conn, batch_time, batch)
+
+def index_typed_keys(conn: sqlite3.Connection, timestamp: str, keys: list[str]) -> None:
+    """Feed a freshly logged keystroke batch into the typed text index."""
+    _live_segmenter.feed(conn, timestamp, keys)
+
+def reset_typed_segment() -> None:
+    """Start a new typed segment, e.g. after the transaction holding the open one failed."""
+    with _live_segmenter.lock:
+        _live_segmenter.reset()
+
+def _match_expression(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query that matches all terms, quoting any syntax characters."""
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    return " ".join(terms) or None
+
+def _search_titles(conn: sqlite3.Connection, match: str, limit: int) -> list[dict]:
+    """Return time ranges spent in windows whose title matches."""
+    ranked = conn.execute(
+        "SELECT rowid, title, bm25(titles_fts) FROM titles_fts WHERE titles_fts MATCH ? ORDER BY rank LIMIT ?",
+        (match, limit)
+    ).fetchall()
+    if not ranked:
+        return []
+    titles = {title_id: (title, rank) for title_id, title, rank in ranked}
+    rows = conn.execute(
+        f"""SELECT activity.title_id, apps.name, activity.timestamp, activity.duration
+            FROM activity JOIN apps ON apps.id = activity.app_id
+            WHERE activity.title_id IN ({", ".join("?" * len(titles))})
+            ORDER BY activity.title_id, activity.timestamp""",
+        list(titles)
+    ).fetchall()
+
+    # Merge back-to-back visits to the same window into one range
+    gap = timedelta(seconds=config_data["SEARCH_SEGMENT_GAP"])
+    results, current = [], None
+    for title_id, app, timestamp, duration in rows:
+        end = datetime.fromisoformat(timestamp)
+        start = end - timedelta(seconds=duration or 0)
+        if current and current["title_id"] == title_id and current["app"] == app and start - current["end"] <= gap:
+            current["end"] = max(current["end"], end)
+            current["duration"] += duration or 0
+            continue
+        title, rank = titles[title_id]
+        current = {"title_id": title_id, "kind": "title", "app": app, "text": title,
+                   "start": start, "end": end, "duration": duration or 0, "rank": rank}
+        results.append(current)
+    for result in results:
+        del result["title_id"]
+    return results
+
+def _search_typed(conn: sqlite3.Connection, match: str, limit: int) -> list[dict]:
+    """Return typed text segments that match."""
+    rows = conn.execute(
+        """SELECT typed_segments.start, typed_segments.end,
+                  snippet(typed_fts, 0, '[', ']', '...', 12), bm25(typed_fts)
+           FROM typed_fts JOIN typed_segments ON typed_segments.id = typed_fts.rowid
+           WHERE typed_fts MATCH ? ORDER BY rank LIMIT ?""",
+        (match, limit)
+    ).fetchall()
+    results = []
+    for start, end, snippet, rank in rows:
+        start, end = datetime.fromisoformat(start), datetime.fromisoformat(end)
+        results.append({"kind": "typed", "app": None, "text": snippet, "start": start, "end": end,
+                        "duration": (end - start).total_seconds(), "rank": rank})
+    return results
+
+def search(query: str, limit: int = 20) -> list[dict]:
+    """
+    Search window titles and typed text.
+    Return up to limit time ranges. bm25 scores from the two indexes are not comparable,
+    so each source is ranked on its own (best match first, most recent first among equals)
+    and the results alternate between sources.
+    """
+    match = _match_expression(query)
+    if match is None:
+        return []
+    try:
+        with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+            sources = [_search_titles(conn, match, limit), _search_typed(conn, match, limit)]
+    except Exception as e:
+        get_logger().error(f"Search failed: {e}")
+        return []
+    for results in sources:
+        results.sort(key=lambda r: r["start"], reverse=True)
+        results.sort(key=lambda r: r["rank"])
+    merged = [r for r in chain.from_iterable(zip_longest(*sources)) if r is not None]
+    return merged[:limit]
+
+def main() -> None:
+    """Command-line entry point: print ranked time ranges for a query."""
+    parser = argparse.ArgumentParser(description="Search tracked window titles and typed text.")
+    parser.add_argument("query", nargs="+", help="words to search for")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="maximum number of results")
+    args = parser.parse_args()
+
+    results = search(" ".join(args.query), args.limit)
+    if not results:
+        print("No matches.")
+    for r in results:
+        source = r["app"] if r["kind"] == "title" else "typed"
+        print(f"{r['start']:%Y-%m-%d %H:%M} - {r['end']:%H:%M}  ({r['duration'] / 60:.0f} min)  [{source}] {r['text']}")
+
+if __name__ == "__main__":
+    main()
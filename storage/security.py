@@ -4,9 +4,14 @@ Handles encryption and storage of sensitive credentials.
 """
 
 import os
+import sqlite3
 from cryptography.fernet import Fernet
 from datetime import datetime
 from config.load_config import config_data
+from storage.db import intern_window, remember_window, resolve_window
+
+# Prefix marking credential records that reference interned app/title ids
+RECORD_V2 = "v2"
 
 # Global variable for the Fernet cipher
 cipher = None
@@ -45,7 +50,16 @@ def encrypt_and_store_credential(username: str, password: str, app: str, title:
     if cipher is None:
         raise RuntimeError("Security not initialized. Call setup_security() first.")
     try:
-        data = f"{datetime.now().isoformat()}||{username}||{password}||{app}||{title}"
+        timestamp = datetime.now().isoformat()
+        try:
+            with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+                app_id, title_id = intern_window(conn, app, title)
+            remember_window(app, title, app_id, title_id)
+            data = f"{RECORD_V2}||{timestamp}||{username}||{password}||{app_id}||{title_id}"
+        except Exception as e:
+            # Keep the credential: the legacy record carries app and title inline
+            get_logger().warning(f"Failed to intern window for credential, storing legacy record: {e}")
+            data = f"{timestamp}||{username}||{password}||{app}||{title}"
         encrypted = cipher.encrypt(data.encode())
         with open(f"{config_data["DB_PATH"]}/creds.bin", "ab") as f:
             f.write(encrypted + b"\n")
@@ -53,6 +67,14 @@ def encrypt_and_store_credential(username: str, password: str, app: str, title:
     except Exception as e:
         get_logger().error(f"Failed to encrypt/store credential: {e}")
 
+def _expand_record(record: str) -> str:
+    """Resolve interned ids in a credential record back to the legacy string format."""
+    if not record.startswith(f"{RECORD_V2}||"):
+        return record
+    head, app_id, title_id = record[len(RECORD_V2) + 2:].rsplit("||", 2)
+    app, title = resolve_window(int(app_id), int(title_id))
+    return f"{head}||{app}||{title}"
+
 def decrypt_credentials() -> list[str]:
     """Decrypt and return all stored credentials as a list of strings."""
     if cipher is None:
@@ -61,7 +83,7 @@ def decrypt_credentials() -> list[str]:
     try:
         with open(f"{config_data["DB_PATH"]}/creds.bin", "rb") as f:
             for line in f:
-                decrypted.append(cipher.decrypt(line.strip()).decode())
+                decrypted.append(_expand_record(cipher.decrypt(line.strip()).decode()))
         return decrypted
     except Exception as e:
         get_logger().error(f"Failed to decrypt credentials: {e}")
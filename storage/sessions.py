@@ -0,0 +1,300 @@
+"""
+Sessionization for Desktop Activity Tracker.
+Groups window switches into work sessions as activity and idle events are written.
+"""
+
+import argparse
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from config.load_config import config_data
+
+# Cap on the topic words remembered per session, keeps similarity checks O(1)
+MAX_SESSION_TOKENS = 200
+
+# Idle periods logged this close together are one period; the idle detector leaves small gaps between reports
+IDLE_MERGE_GAP = 5
+
+# Initialize logger for sessionization
+main_logger = None
+def get_logger():
+    """Get the main logger instance, initializing it if necessary."""
+    global main_logger
+    if main_logger is None:
+        from logging_utils.logger import init_logger
+        main_logger = init_logger("SESSIONS")
+    return main_logger
+
+def _tokens(title: Optional[str]) -> set[str]:
+    """Return the lower-cased words of a window title that are long enough to carry meaning."""
+    return {word for word in re.split(r"\W+", (title or "").lower()) if len(word) > 2}
+
+class _Event:
+    """A single window visit, or the part of one that does not overlap a logged idle period."""
+    def __init__(self, start: datetime, end: datetime, app_id: int, title_id: int, title: str) -> None:
+        self.start = start
+        self.end = end
+        self.app_id = app_id
+        self.title_id = title_id
+        self.tokens = _tokens(title)
+        self.seconds = (end - start).total_seconds()
+
+class _Session:
+    """
+    Running totals for one session.
+    The dominant app and title are the ones with the most focused time so far.
+    """
+    def __init__(self, event: _Event) -> None:
+        self.id = None
+        self.start = event.start
+        self.end = event.end
+        self.app_seconds = {}
+        self.title_seconds = {}
+        self.app_id = event.app_id
+        self.title_id = event.title_id
+        self.tokens = set()
+        self.active = 0.0
+        self.events = 0
+        self.add(event)
+
+    def add(self, event: _Event, topical: bool = True) -> None:
+        """Fold an event into the session; interruptions count towards time but not topic."""
+        self.start = min(self.start, event.start)
+        self.end = max(self.end, event.end)
+        self.active += event.seconds
+        self.events += 1
+        self.app_seconds[event.app_id] = self.app_seconds.get(event.app_id, 0.0) + event.seconds
+        if self.app_seconds[event.app_id] > self.app_seconds[self.app_id]:
+            self.app_id = event.app_id
+        self.title_seconds[event.title_id] = self.title_seconds.get(event.title_id, 0.0) + event.seconds
+        if self.title_seconds[event.title_id] > self.title_seconds[self.title_id]:
+            self.title_id = event.title_id
+        if topical and len(self.tokens) < MAX_SESSION_TOKENS:
+            self.tokens |= event.tokens
+
+    def related(self, event: _Event) -> bool:
+        """Return True if the event continues this session's task."""
+        if event.app_id == self.app_id:
+            return True
+        if not event.tokens:
+            return False
+        overlap = len(event.tokens & self.tokens) / len(event.tokens)
+        return overlap >= config_data["SESSION_TITLE_SIMILARITY"]
+
+    def save(self, conn: sqlite3.Connection) -> None:
+        """Insert or update the session row."""
+        values = (self.start.isoformat(), self.end.isoformat(), self.app_id, self.title_id, self.active, self.events)
+        if self.id is None:
+            cur = conn.execute(
+                "INSERT INTO sessions (start, end, app_id, title_id, active, events) VALUES (?, ?, ?, ?, ?, ?)",
+                values
+            )
+            self.id = cur.lastrowid
+        else:
+            conn.execute(
+                "UPDATE sessions SET start = ?, end = ?, app_id = ?, title_id = ?, active = ?, events = ? WHERE id = ?",
+                values + (self.id,)
+            )
+
+class Sessionizer:
+    """
+    Sessionizer turns the stream of window switches into work sessions.
+    Short unrelated switches are held back and merged into the session if the user returns to it;
+    otherwise they start the next session. Idle periods and gaps in tracking always end a session.
+    An idle period is usually logged while the user is still in a window, before that visit is,
+    so idle periods are held until the covering visit arrives and only their interval is cut out of it.
+    Each event is handled in O(1) amortized time.
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.idle_periods = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the open session; the next event starts a new one."""
+        self.session = None
+        self.pending = []
+        self.pending_seconds = 0.0
+        self.last_end = None
+
+    def on_activity(self, conn: sqlite3.Connection, timestamp: str, app_id: int, title_id: int,
+                    title: str, duration: float) -> None:
+        """Handle a window visit that ended at timestamp after duration seconds."""
+        with self.lock:
+            end = datetime.fromisoformat(timestamp)
+            start = end - timedelta(seconds=duration or 0)
+            pieces, split = self._subtract_idle(start, end)
+            for piece_start, piece_end, after_idle in pieces:
+                if after_idle:
+                    self.close(conn)
+                self._add_visit(conn, _Event(piece_start, piece_end, app_id, title_id, title))
+            if split and not pieces:
+                self.close(conn)
+            self.idle_periods = [period for period in self.idle_periods if period[1] > end]
+
+    def on_idle(self, conn: sqlite3.Connection, timestamp: str, duration: float) -> None:
+        """Handle an idle period that was detected at timestamp after duration seconds without input."""
+        with self.lock:
+            idle_end = datetime.fromisoformat(timestamp)
+            idle_start = idle_end - timedelta(seconds=duration or 0)
+            if self.idle_periods and (idle_start - self.idle_periods[-1][1]).total_seconds() <= IDLE_MERGE_GAP:
+                idle_start = min(idle_start, self.idle_periods[-1][0])
+                idle_end = max(idle_end, self.idle_periods[-1][1])
+                self.idle_periods.pop()
+            self.idle_periods.append((idle_start, idle_end))
+
+    def _subtract_idle(self, start: datetime, end: datetime) -> tuple[list, bool]:
+        """
+        Cut the held idle periods out of a visit.
+        Return the remaining (start, end, after_idle) pieces, and whether any idle period
+        began before the visit ended.
+        """
+        pieces, cursor, seen_idle = [], start, False
+        for idle_start, idle_end in self.idle_periods:
+            if idle_start >= end:
+                break
+            if idle_start > cursor:
+                pieces.append((cursor, idle_start, seen_idle))
+            seen_idle = True
+            cursor = max(cursor, idle_end)
+        if cursor < end:
+            pieces.append((cursor, end, seen_idle))
+        return pieces, seen_idle
+
+    def _add_visit(self, conn: sqlite3.Connection, event: _Event) -> None:
+        """Fold one idle-free visit into the open session, hold it back, or start a new session."""
+        if event.seconds <= 0:
+            return
+        if self.last_end is not None and (event.start - self.last_end).total_seconds() > config_data["SESSION_IDLE_GAP"]:
+            self.close(conn)
+        self.last_end = event.end
+
+        if self.session is None:
+            self.session = _Session(event)
+        elif self.session.related(event):
+            # The user came back: earlier short switches were interruptions
+            for interruption in self.pending:
+                self.session.add(interruption, topical=False)
+            self._clear_pending()
+            self.session.add(event)
+        elif self.pending_seconds + event.seconds < config_data["SESSION_INTERRUPTION"]:
+            self.pending.append(event)
+            self.pending_seconds += event.seconds
+            return
+        else:
+            # The user moved on: held-back switches open the next session
+            events = self.pending + [event]
+            self._clear_pending()
+            self.session = _Session(events[0])
+            for e in events[1:]:
+                self.session.add(e)
+        self.session.save(conn)
+
+    def _clear_pending(self) -> None:
+        """Drop the held-back interruptions."""
+        self.pending = []
+        self.pending_seconds = 0.0
+
+    def close(self, conn: sqlite3.Connection) -> None:
+        """Persist and end the open session; held-back switches the user never returned from become the next session."""
+        if self.session is not None:
+            self.session.save(conn)
+        if self.pending:
+            moved_on = _Session(self.pending[0])
+            for e in self.pending[1:]:
+                moved_on.add(e)
+            moved_on.save(conn)
+        self.reset()
+
+# Sessionizer fed by the live window and idle trackers
+_live_sessionizer = Sessionizer()
+
+def init_sessions(c: sqlite3.Cursor) -> None:
+    """Create the sessions table and view, rebuilding sessions from existing history on first run."""
+    created = c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions'").fetchone() is None
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY, start TEXT, end TEXT,
+            app_id INTEGER REFERENCES apps(id), title_id INTEGER REFERENCES titles(id),
+            active REAL, events INTEGER
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions (start)")
+    c.execute("""
+        CREATE VIEW IF NOT EXISTS sessions_named AS
+        SELECT sessions.id, sessions.start, sessions.end, apps.name AS app, titles.title AS title,
+               sessions.active, sessions.events
+        FROM sessions
+        JOIN apps ON apps.id = sessions.app_id
+        JOIN titles ON titles.id = sessions.title_id
+    """)
+    if created:
+        _backfill_sessions(c.connection)
+        get_logger().info("Built sessions from existing activity history.")
+
+def _backfill_sessions(conn: sqlite3.Connection) -> None:
+    """Replay every stored activity and idle event through a fresh sessionizer."""
+    sessionizer = Sessionizer()
+    rows = conn.execute("""
+        SELECT activity.timestamp, activity.app_id, activity.title_id, titles.title, activity.duration
+        FROM activity JOIN titles ON titles.id = activity.title_id
+        UNION ALL
+        SELECT timestamp, NULL, NULL, NULL, duration FROM idle
+        ORDER BY 1
+    """).fetchall()
+    for timestamp, app_id, title_id, title, duration in rows:
+        if app_id is None:
+            sessionizer.on_idle(conn, timestamp, duration)
+        else:
+            sessionizer.on_activity(conn, timestamp, app_id, title_id, title, duration)
+    sessionizer.close(conn)
+
+def record_activity(conn: sqlite3.Connection, timestamp: str, app_id: int, title_id: int,
+                    title: str, duration: float) -> None:
+    """Feed a freshly logged window visit into the live sessionizer."""
+    _live_sessionizer.on_activity(conn, timestamp, app_id, title_id, title, duration)
+
+def record_idle(conn: sqlite3.Connection, timestamp: str, duration: float) -> None:
+    """Feed a freshly logged idle period into the live sessionizer."""
+    _live_sessionizer.on_idle(conn, timestamp, duration)
+
+def reset_session() -> None:
+    """Start a new session, e.g. after the transaction holding the open one failed."""
+    with _live_sessionizer.lock:
+        _live_sessionizer.reset()
+
+def flush_sessions() -> None:
+    """Persist the live sessionizer's open session and held-back switches, e.g. when the tracker stops."""
+    try:
+        with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+            with _live_sessionizer.lock:
+                _live_sessionizer.close(conn)
+            conn.commit()
+    except Exception as e:
+        get_logger().error(f"Failed to flush sessions: {e}")
+
+def sessions_for_day(day: Optional[str] = None) -> list[tuple]:
+    """Return (start, end, app, title, active, events) rows for sessions that started on day (default: today)."""
+    day = day or str(datetime.now().date())
+    with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+        return conn.execute(
+            "SELECT start, end, app, title, active, events FROM sessions_named WHERE start >= ? AND start < date(?, '+1 day') ORDER BY start",
+            (day, day)
+        ).fetchall()
+
+def main() -> None:
+    """Command-line entry point: print the sessions for a day."""
+    parser = argparse.ArgumentParser(description="List tracked work sessions for a day.")
+    parser.add_argument("day", nargs="?", help="date as YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+
+    rows = sessions_for_day(args.day)
+    if not rows:
+        print("No sessions.")
+    for start, end, app, title, active, events in rows:
+        print(f"{start[11:16]} - {end[11:16]}  ({active / 60:.0f} min, {events} switches)  [{app}] {title}")
+
+if __name__ == "__main__":
+    main()
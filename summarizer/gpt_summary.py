@@ -6,8 +6,10 @@ Generates a daily productivity summary using OpenAI GPT.
 import openai
 import sqlite3
 import os
+import threading
 import time
 from datetime import datetime
+from typing import Optional
 from pynput import keyboard as pynput_keyboard
 from dotenv import load_dotenv
 from config.load_config import config_data
@@ -23,9 +25,9 @@ def get_logger():
     return main_logger
 
 def _summary_hotkey_callback() -> None:
-    """Callback for manual summary generation via hotkey."""
-    get_logger().info("Generating daily summary via hotkey.")
-    summarize_day()
+    """Callback for manual summary generation via hotkey; only queues the job."""
+    from summarizer.summary_jobs import request_summary
+    request_summary("hotkey")
 
 def listen_for_summary_trigger() -> None:
     """Listen for Ctrl+Shift+S to trigger summary generation."""
@@ -47,29 +49,40 @@ def listen_for_summary_trigger() -> None:
 
 def schedule_nightly_summary() -> None:
     """Automatically generate summary each day."""
+    from summarizer.summary_jobs import request_summary
     while True:
         now = time.localtime()
         if now.tm_hour == config_data["SUMMARY_HOUR"] and now.tm_min == config_data["SUMMARY_MINUTE"]:
             get_logger().info(f"Generating nightly summary at {config_data["SUMMARY_HOUR"]}:{config_data["SUMMARY_MINUTE"]}.")
-            summarize_day()
+            request_summary("nightly")
             time.sleep(60)
         time.sleep(10)
 
-def summarize_day() -> None:
-    """Generate and log a daily summary of user activity using OpenAI GPT."""
+def summarize_day(cancel_event: Optional[threading.Event] = None, deadline: Optional[float] = None) -> Optional[str]:
+    """
+    Generate and log a daily summary of user activity using OpenAI GPT.
+    Tokens are streamed to the summary file as they arrive; generation stops early
+    if cancel_event is set or the monotonic deadline passes.
+    """
     # Load environment variables
     load_dotenv()
     openai.api_key = os.getenv("OPENAI_API_KEY")
     try:
         with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
             c = conn.cursor()
-            c.execute("SELECT * FROM activity WHERE timestamp >= date('now')")
-            activities = c.fetchall()
+            c.execute("SELECT start, end, app, title, active FROM sessions_named WHERE start >= date('now') ORDER BY start")
+            sessions = c.fetchall()
             c.execute("SELECT * FROM keystrokes WHERE timestamp >= date('now')")
             keystrokes = c.fetchall()
     except Exception as db_err:
         get_logger().error(f"Database error: {db_err}")
-        return
+        return None
+
+    # Condense sessions to time range, main app and window, and focused minutes
+    session_lines = [
+        f"{start[11:16]}-{end[11:16]} {app} | {title} | {active / 60:.0f} min"
+        for start, end, app, title, active in sessions
+    ]
 
     # Redact sensitive keystrokes
     redacted_keys = [k if k != "[REDACTED]" else "" for _, k in keystrokes]
@@ -77,30 +90,61 @@ def summarize_day() -> None:
     # Prepare prompt for GPT
     prompt = f"""
         You are a productivity analyst. Summarize this user's day based on:
-        - App usage and window titles
+        - Work sessions (time range, main app and window title, focused minutes)
         - Keystrokes (with sensitive inputs redacted)
         Give insights on what they did, how long they were productive, what topics they were focused on, and any distractions.
         DATA:
-        ACTIVITY: {activities[:50]}
+        SESSIONS: {session_lines[:100]}
         KEYS: {redacted_keys[:50]}
     """
 
     try:
         if not openai.api_key:
             get_logger().error("OPENAI_API_KEY not set. Please set it in your environment or .env file.")
-            return
-        response = openai.chat.completions.create(
+            return None
+        if cancel_event is not None and cancel_event.is_set():
+            get_logger().info("Summary cancelled before request was sent.")
+            return None
+        request_timeout = None if deadline is None else max(deadline - time.monotonic(), 1.0)
+        stream = openai.chat.completions.create(
             model=config_data["GPT_MODEL"],
-            messages=[{"role": "system", "content": prompt}]
+            messages=[{"role": "system", "content": prompt}],
+            stream=True,
+            timeout=request_timeout
         )
-        summary = response.choices[0].message.content
-        get_logger().info(f"--- Daily Summary ---\n{summary}")
 
-        # Save summary to file
+        # Stream summary to a partial file so an unfinished run never replaces a good summary
         os.makedirs(config_data["LOG_DIR"], exist_ok=True)
-        with open(f"{config_data["LOG_DIR"]}/summary_{datetime.now().date()}.txt", "w", encoding="utf-8") as f:
-            f.write(summary)
+        summary_path = f"{config_data["LOG_DIR"]}/summary_{datetime.now().date()}.txt"
+        partial_path = f"{summary_path}.partial"
+        parts = []
+        stopped = None
+        try:
+            with open(partial_path, "w", encoding="utf-8") as f:
+                for chunk in stream:
+                    if cancel_event is not None and cancel_event.is_set():
+                        stopped = "cancelled"
+                        break
+                    if deadline is not None and time.monotonic() > deadline:
+                        stopped = "timed out"
+                        break
+                    token = chunk.choices[0].delta.content if chunk.choices else None
+                    if token:
+                        parts.append(token)
+                        f.write(token)
+                        f.flush()
+        finally:
+            stream.close()
+
+        summary = "".join(parts)
+        if stopped:
+            get_logger().warning(f"Summary {stopped} after {len(summary)} characters; partial summary kept in {partial_path}.")
+            return None
+        os.replace(partial_path, summary_path)
+        get_logger().info(f"--- Daily Summary ---\n{summary}")
         get_logger().info("Summary saved to file.")
+        return summary
 
     except Exception as e:
         get_logger().error(f"Failed to generate summary: {e}")
+        return None
@@ -0,0 +1,147 @@
+"""
+Summary job service for Desktop Activity Tracker.
+Runs summary generation on a shared worker pool so triggers never block.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+from typing import Callable, Optional
+from config.load_config import config_data
+
+# Shared service instance, created on first use
+_service = None
+_service_lock = threading.Lock()
+
+# Initialize logger for summary jobs
+main_logger = None
+def get_logger():
+    """Get the main logger instance, initializing it if necessary."""
+    global main_logger
+    if main_logger is None:
+        from logging_utils.logger import init_logger
+        main_logger = init_logger("SUMMARY")
+    return main_logger
+
+class SummaryJob:
+    """
+    A single summary generation job for one day.
+    Holds the cancel flag and deadline checked by the streaming worker.
+    """
+    def __init__(self, key: str, reason: str, timeout: float, summarize: Callable) -> None:
+        self.key = key
+        self.summarize = summarize
+        self.reasons = [reason]
+        self.timeout = timeout
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    def cancel(self) -> None:
+        """Request cancellation; a queued job is dropped, a running one stops at the next token."""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self) -> bool:
+        """Return True if the job has finished, failed or been cancelled."""
+        return self.future is not None and self.future.done()
+
+    def run(self) -> Optional[str]:
+        """Generate the summary, honouring cancellation and the job timeout."""
+        if self.cancel_event.is_set():
+            get_logger().info(f"Summary job for {self.key} cancelled before start.")
+            return None
+        get_logger().info(f"Summary job for {self.key} started ({', '.join(self.reasons)}).")
+        return self.summarize(
+            cancel_event=self.cancel_event,
+            deadline=time.monotonic() + self.timeout
+        )
+
+class SummaryJobService:
+    """
+    SummaryJobService owns the summary worker pool.
+    Requests for a day that already has a job in flight are merged into it.
+    """
+    def __init__(self, max_workers: int = 1, timeout: float = 120.0, summarize: Optional[Callable] = None) -> None:
+        if summarize is None:
+            from summarizer.gpt_summary import summarize_day as summarize
+        self.timeout = timeout
+        self.summarize = summarize
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summary")
+        self._jobs: dict[str, SummaryJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, reason: str) -> SummaryJob:
+        """Queue a summary for today, or return the job already in flight. Never blocks."""
+        key = str(datetime.now().date())
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.done() and not job.cancel_event.is_set():
+                job.reasons.append(reason)
+                get_logger().info(f"Summary request ({reason}) merged into in-flight job for {key}.")
+                return job
+            job = SummaryJob(key, reason, self.timeout, self.summarize)
+            job.future = self._executor.submit(job.run)
+            self._jobs[key] = job
+        # Registered outside the lock: a job that already finished runs _finish on this thread
+        job.future.add_done_callback(lambda f, j=job: self._finish(j, f))
+        get_logger().info(f"Summary job for {key} queued ({reason}).")
+        return job
+
+    def cancel(self, key: Optional[str] = None) -> bool:
+        """Cancel the job for the given day (default: today). Return True if one was in flight."""
+        key = key or str(datetime.now().date())
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None or job.done():
+            return False
+        job.cancel()
+        get_logger().info(f"Summary job for {key} cancellation requested.")
+        return True
+
+    def shutdown(self, cancel: bool = True) -> None:
+        """Stop the worker pool, cancelling outstanding jobs unless told otherwise."""
+        if cancel:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            for job in jobs:
+                job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=cancel)
+
+    def _finish(self, job: SummaryJob, future: Future) -> None:
+        """Drop a finished job from the in-flight table and log its outcome."""
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+        if future.cancelled():
+            get_logger().info(f"Summary job for {job.key} cancelled.")
+        elif future.exception() is not None:
+            get_logger().error(f"Summary job for {job.key} failed: {future.exception()}")
+
+def get_summary_service() -> SummaryJobService:
+    """Get the shared summary job service, creating it if necessary."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SummaryJobService(
+                max_workers=config_data["SUMMARY_WORKERS"],
+                timeout=config_data["SUMMARY_TIMEOUT"]
+            )
+        return _service
+
+def shutdown_summary_service() -> None:
+    """Shut down the shared summary job service if one was created; does nothing otherwise."""
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.shutdown()
+
+def request_summary(reason: str) -> SummaryJob:
+    """Queue a summary for today without waiting for it."""
+    return get_summary_service().submit(reason)
+
+def cancel_summary(key: Optional[str] = None) -> bool:
+    """Cancel the in-flight summary for the given day (default: today)."""
+    return get_summary_service().cancel(key)
@@ -0,0 +1,18 @@
+import pytest
+from config.load_config import config_data
+from storage import db
+from storage.search import reset_typed_segment
+from storage.sessions import _live_sessionizer
+
+@pytest.fixture(autouse=True)
+def isolated_paths(tmp_path, monkeypatch):
+    """Point the database and logs at a per-test temporary directory."""
+    monkeypatch.setitem(config_data, "DB_PATH", str(tmp_path))
+    monkeypatch.setitem(config_data, "LOG_DIR", str(tmp_path))
+    # Cached ids, the open typed segment and session belong to the previous test's database
+    for cache in db._intern_cache.values():
+        cache.clear()
+    reset_typed_segment()
+    _live_sessionizer.reset()
+    _live_sessionizer.idle_periods = []
+    return tmp_path
@@ -0,0 +1,71 @@
+import sqlite3
+import pytest
+from config.load_config import config_data
+from storage import db
+
+@pytest.fixture
+def connect():
+    def _connect():
+        return sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}")
+    return _connect
+
+def _legacy_db(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE TABLE activity (timestamp TEXT, app TEXT, title TEXT, duration REAL)")
+    conn.executemany("INSERT INTO activity VALUES (?, ?, ?, ?)", [
+        ("2025-10-01T09:00:00", "code.exe", "main.py", 60.0),
+        ("2025-10-01T09:01:00", "chrome.exe", "Docs", 30.0),
+        ("2025-10-01T09:02:00", "code.exe", "main.py", 90.0),
+    ])
+    conn.commit()
+
+def test_legacy_activity_is_migrated_to_interned_ids(connect):
+    with connect() as conn:
+        _legacy_db(conn)
+    db.init_db()
+    with connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM apps").fetchone()[0] == 2
+        assert conn.execute("SELECT app, title, duration FROM activity_named ORDER BY timestamp").fetchall() == [
+            ("code.exe", "main.py", 60.0), ("chrome.exe", "Docs", 30.0), ("code.exe", "main.py", 90.0)
+        ]
+
+def test_failed_migration_rolls_back_schema_changes(connect, monkeypatch):
+    with connect() as conn:
+        _legacy_db(conn)
+
+    def fail(c):
+        raise sqlite3.OperationalError("boom")
+    monkeypatch.setattr(db, "_migrate_legacy_activity", fail)
+    with pytest.raises(sqlite3.OperationalError):
+        db.init_db()
+    with connect() as conn:
+        assert "app" in [row[1] for row in conn.execute("PRAGMA table_info(activity)")]
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'activity_legacy'").fetchone() is None
+
+def test_leftover_legacy_table_is_migrated(connect):
+    with connect() as conn:
+        _legacy_db(conn)
+        conn.execute("ALTER TABLE activity RENAME TO activity_legacy")
+        conn.execute("CREATE TABLE activity (timestamp TEXT, app_id INTEGER, title_id INTEGER, duration REAL)")
+    db.init_db()
+    with connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM activity_named").fetchone()[0] == 3
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'activity_legacy'").fetchone() is None
+
+def test_rolled_back_ids_are_not_cached(connect, monkeypatch):
+    db.init_db()
+
+    visible_before_commit = []
+    def fail(*args):
+        visible_before_commit.append("rolled.exe" in db._intern_cache["apps"])
+        raise sqlite3.OperationalError("boom")
+    update_index = db._update_index
+    monkeypatch.setattr(db, "_update_index", fail)
+    db.log_activity("rolled.exe", "Rolled back", 5.0)
+    assert visible_before_commit == [False]
+    assert "rolled.exe" not in db._intern_cache["apps"]
+
+    monkeypatch.setattr(db, "_update_index", update_index)
+    db.log_activity("kept.exe", "Kept", 5.0)
+    with connect() as conn:
+        app_id = conn.execute("SELECT id FROM apps WHERE name = 'kept.exe'").fetchone()[0]
+    assert db._intern_cache["apps"]["kept.exe"] == app_id
@@ -0,0 +1,55 @@
+import sqlite3
+from config.load_config import config_data
+from storage import db
+from storage.search import search
+
+def _segments():
+    with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+        return [row[0] for row in conn.execute("SELECT text FROM typed_segments ORDER BY id")]
+
+def test_redacted_input_splits_segments_and_is_not_indexed():
+    db.init_db()
+    db.log_keystrokes_batch(list("user") + ["[REDACTED]"] * 6 + list("next"))
+    assert _segments() == ["user", "next"]
+    assert search("REDACTED") == []
+
+def test_backspace_and_enter_shape_segments():
+    db.init_db()
+    db.log_keystrokes_batch(list("helo") + ["Key.backspace"] + list("lo") + ["Key.space"] + list("you") + ["Key.enter"] + list("bye"))
+    assert _segments() == ["hello you", "bye"]
+    assert [r["text"] for r in search("hello")] == ["[hello] you"]
+
+def test_segment_grows_across_batches():
+    db.init_db()
+    db.log_keystrokes_batch(list("ticket "))
+    db.log_keystrokes_batch(list("ABC-123"))
+    assert _segments() == ["ticket ABC-123"]
+    assert [r["kind"] for r in search("abc-123")] == ["typed"]
+
+def test_results_alternate_between_sources():
+    db.init_db()
+    db.log_activity("chrome.exe", "ABC-123 review", 60.0)
+    db.log_activity("code.exe", "ABC-123 notes", 60.0)
+    db.log_keystrokes_batch(list("fixing ABC-123"))
+    assert [r["kind"] for r in search("abc-123")] == ["title", "typed", "title"]
+
+def test_index_failure_keeps_raw_keystrokes(monkeypatch):
+    db.init_db()
+
+    def fail(*args):
+        raise sqlite3.OperationalError("no such module: fts5")
+    monkeypatch.setattr(db, "index_typed_keys", fail)
+    db.log_keystrokes_batch(list("abc"))
+    with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM keystrokes").fetchone()[0] == 3
+
+def test_search_setup_failure_does_not_block_tracking(monkeypatch):
+    def fail(c):
+        raise sqlite3.OperationalError("no such module: fts5")
+    monkeypatch.setattr(db, "init_search", fail)
+    db.init_db()
+    db.log_activity("code.exe", "main.py", 5.0)
+    db.log_keystrokes_batch(list("abc"))
+    with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM activity").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM keystrokes").fetchone()[0] == 3
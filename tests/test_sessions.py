@@ -0,0 +1,103 @@
+import sqlite3
+import pytest
+from config.load_config import config_data
+from storage import db, sessions
+from storage.sessions import Sessionizer
+
+APP_CODE, APP_CHROME, APP_SLACK = 1, 2, 3
+
+@pytest.fixture
+def conn():
+    db.init_db()
+    conn = sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}")
+    conn.executemany("INSERT INTO apps (id, name) VALUES (?, ?)", [(APP_CODE, "code.exe"), (APP_CHROME, "chrome.exe"), (APP_SLACK, "slack.exe")])
+    conn.executemany("INSERT INTO titles (id, title) VALUES (?, ?)", [(1, "tracker.py - VS Code"), (2, "Docs - Chrome"), (3, "general - Slack"), (4, "YouTube - Chrome")])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def _sessions(conn):
+    return conn.execute("SELECT start, end, app, active, events FROM sessions_named ORDER BY start").fetchall()
+
+def test_idle_period_is_cut_out_of_the_covering_visit(conn):
+    sessionizer = Sessionizer()
+    sessionizer.on_idle(conn, "2025-10-01T10:05:00", 300)
+    sessionizer.on_activity(conn, "2025-10-01T10:15:00", APP_CODE, 1, "tracker.py - VS Code", 75 * 60)
+    sessionizer.close(conn)
+    assert _sessions(conn) == [
+        ("2025-10-01T09:00:00", "2025-10-01T10:00:00", "code.exe", 3600.0, 1),
+        ("2025-10-01T10:05:00", "2025-10-01T10:15:00", "code.exe", 600.0, 1),
+    ]
+
+def test_idle_split_matches_backfill(conn):
+    conn.execute("INSERT INTO idle VALUES ('2025-10-01T10:05:00', 300)")
+    conn.execute("INSERT INTO activity VALUES ('2025-10-01T10:15:00', ?, 1, ?)", (APP_CODE, 75 * 60.0))
+    conn.execute("DROP VIEW sessions_named")
+    conn.execute("DROP TABLE sessions")
+    conn.commit()
+    db.init_db()
+    assert [row[3] for row in _sessions(conn)] == [3600.0, 600.0]
+
+def test_short_interruption_is_merged_when_user_returns(conn):
+    sessionizer = Sessionizer()
+    sessionizer.on_activity(conn, "2025-10-01T09:10:00", APP_CODE, 1, "tracker.py - VS Code", 600)
+    sessionizer.on_activity(conn, "2025-10-01T09:10:30", APP_SLACK, 3, "general - Slack", 30)
+    sessionizer.on_activity(conn, "2025-10-01T09:20:00", APP_CODE, 1, "tracker.py - VS Code", 570)
+    assert _sessions(conn) == [("2025-10-01T09:00:00", "2025-10-01T09:20:00", "code.exe", 1200.0, 3)]
+
+def test_long_switch_starts_new_session_with_held_back_switches(conn):
+    sessionizer = Sessionizer()
+    sessionizer.on_activity(conn, "2025-10-01T09:10:00", APP_CODE, 1, "tracker.py - VS Code", 600)
+    sessionizer.on_activity(conn, "2025-10-01T09:10:30", APP_SLACK, 3, "general - Slack", 30)
+    sessionizer.on_activity(conn, "2025-10-01T09:40:30", APP_CHROME, 4, "YouTube - Chrome", 1800)
+    assert _sessions(conn) == [
+        ("2025-10-01T09:00:00", "2025-10-01T09:10:00", "code.exe", 600.0, 1),
+        ("2025-10-01T09:10:00", "2025-10-01T09:40:30", "chrome.exe", 1830.0, 2),
+    ]
+
+def test_unreturned_interruption_before_idle_starts_next_session(conn):
+    sessionizer = Sessionizer()
+    sessionizer.on_activity(conn, "2025-10-01T09:10:00", APP_CODE, 1, "tracker.py - VS Code", 600)
+    sessionizer.on_idle(conn, "2025-10-01T09:15:30", 300)
+    sessionizer.on_activity(conn, "2025-10-01T09:16:00", APP_SLACK, 3, "general - Slack", 360)
+    sessionizer.close(conn)
+    assert _sessions(conn) == [
+        ("2025-10-01T09:00:00", "2025-10-01T09:10:00", "code.exe", 600.0, 1),
+        ("2025-10-01T09:10:00", "2025-10-01T09:10:30", "slack.exe", 30.0, 1),
+        ("2025-10-01T09:15:30", "2025-10-01T09:16:00", "slack.exe", 30.0, 1),
+    ]
+
+def test_session_failure_keeps_raw_activity(conn, monkeypatch):
+    def fail(*args):
+        raise sqlite3.OperationalError("boom")
+    monkeypatch.setattr(db, "record_activity", fail)
+    db.log_activity("code.exe", "tracker.py - VS Code", 60.0)
+    assert conn.execute("SELECT COUNT(*) FROM activity").fetchone()[0] == 1
+
+def test_back_to_back_idle_reports_leave_no_sliver_sessions(conn):
+    sessionizer = Sessionizer()
+    sessionizer.on_idle(conn, "2025-10-01T10:05:00", 300)
+    sessionizer.on_idle(conn, "2025-10-01T10:10:00.020000", 300)
+    sessionizer.on_idle(conn, "2025-10-01T10:15:00.041000", 300)
+    sessionizer.on_activity(conn, "2025-10-01T10:25:00", APP_CODE, 1, "tracker.py - VS Code", 85 * 60)
+    sessionizer.close(conn)
+    assert _sessions(conn) == [
+        ("2025-10-01T09:00:00", "2025-10-01T10:00:00", "code.exe", 3600.0, 1),
+        ("2025-10-01T10:15:00.041000", "2025-10-01T10:25:00", "code.exe", 599.959, 1),
+    ]
+
+def test_flush_persists_held_back_switches(conn):
+    db.log_activity("code.exe", "tracker.py - VS Code", 600.0)
+    db.log_activity("slack.exe", "general - Slack", 30.0)
+    assert [row[2] for row in _sessions(conn)] == ["code.exe"]
+    sessions.flush_sessions()
+    assert [row[2] for row in _sessions(conn)] == ["code.exe", "slack.exe"]
+
+def test_sessions_setup_failure_does_not_block_tracking(monkeypatch):
+    def fail(c):
+        raise ValueError("Invalid isoformat string: 'garbage'")
+    monkeypatch.setattr(db, "init_sessions", fail)
+    db.init_db()
+    db.log_activity("code.exe", "tracker.py - VS Code", 60.0)
+    with sqlite3.connect(f"{config_data["DB_PATH"]}/{config_data["DB_FILE"]}") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM activity").fetchone()[0] == 1
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import Future
+from summarizer import summary_jobs
+from summarizer.summary_jobs import SummaryJobService
+
+def _blocking_summarize(started: threading.Event, release: threading.Event, calls: list):
+    def summarize(cancel_event, deadline):
+        calls.append(1)
+        started.set()
+        while not release.is_set():
+            if cancel_event.is_set():
+                return None
+            release.wait(0.01)
+        return "summary"
+    return summarize
+
+def test_duplicate_requests_share_one_job():
+    started, release, calls = threading.Event(), threading.Event(), []
+    service = SummaryJobService(summarize=_blocking_summarize(started, release, calls))
+    first = service.submit("hotkey")
+    started.wait(1)
+    second = service.submit("nightly")
+    assert second is first
+    assert first.reasons == ["hotkey", "nightly"]
+    release.set()
+    assert first.future.result(timeout=1) == "summary"
+    assert len(calls) == 1
+    service.shutdown()
+
+def test_cancel_stops_running_job_and_allows_a_new_one():
+    started, release, calls = threading.Event(), threading.Event(), []
+    service = SummaryJobService(summarize=_blocking_summarize(started, release, calls))
+    job = service.submit("tray")
+    started.wait(1)
+    assert service.cancel(job.key)
+    assert job.future.result(timeout=1) is None
+    release.set()
+    assert service.submit("tray") is not job
+    service.shutdown()
+
+class _InlineExecutor:
+    """Runs jobs on the submitting thread, so their futures are done before submit() returns."""
+    def submit(self, fn):
+        future = Future()
+        future.set_result(fn())
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+def test_submit_does_not_deadlock_when_job_finishes_immediately():
+    service = SummaryJobService(summarize=lambda cancel_event, deadline: None)
+    service._executor = _InlineExecutor()
+    submitter = threading.Thread(target=service.submit, args=("hotkey",), daemon=True)
+    submitter.start()
+    submitter.join(timeout=2)
+    assert not submitter.is_alive()
+    assert service._jobs == {}
+
+def test_shutdown_without_service_does_not_create_one(monkeypatch):
+    monkeypatch.setattr(summary_jobs, "_service", None)
+    summary_jobs.shutdown_summary_service()
+    assert summary_jobs._service is None